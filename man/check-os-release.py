@@ -5,6 +5,8 @@ import ast
 import re
 import sys
 
+_KV_RE = re.compile(r'([A-Z][A-Z_0-9]+)=(.*)')
+
 def read_os_release():
     try:
         filename = '/etc/os-release'
@@ -17,7 +19,7 @@ def read_os_release():
         line = line.rstrip()
         if not line or line.startswith('#'):
             continue
-        m = re.match(r'([A-Z][A-Z_0-9]+)=(.*)', line)
+        m = _KV_RE.match(line)
         if m:
             name, val = m.groups()
             if val and val[0] in '"\'':
@@ -10,6 +10,9 @@ OVERRIDES = {
     'autoneg' : 'autonegotiation',
 }
 
+# ETHTOOL_LINK_MODE_10baseT_Half_BIT	= 0,
+_ENUM_RE = re.compile(r'^\s*(ETHTOOL_LINK_MODE_((\d*).*)_BIT)\s*=\s*(\d+),')
+
 mode, cpp, header = sys.argv[1:]
 xml = mode == '--xml'
 
@@ -25,8 +28,7 @@ entries = []
 for line in lines:
     if line.startswith('}'):
         break
-    # ETHTOOL_LINK_MODE_10baseT_Half_BIT	= 0,
-    m = re.match(r'^\s*(ETHTOOL_LINK_MODE_((\d*).*)_BIT)\s*=\s*(\d+),', line)
+    m = _ENUM_RE.match(line)
     if not m:
         continue
     enum, name, speed, value = m.groups()
@@ -40,22 +42,26 @@ for line in lines:
 
     entries += [(enum, name, speed, value, duplex)]
 
+output = []
+
 if xml:
-    print('              <tbody>')
+    output.append('              <tbody>\n')
 
     entries.sort(key=lambda entry: (int(entry[2]) if entry[2] else 1e20, entry[4], entry[1], entry[3]))
 
 for enum, name, speed, value, duplex in entries:
     if xml:
-        print(f'''\
+        output.append(f'''\
                 <row><entry><option>{name}</option></entry>
                 <entry>{speed}</entry><entry>{duplex}</entry></row>
-        ''')
+        \n''')
     else:
         enum = f'[{enum}]'
-        print(f'        {enum:50} = "{name}",')
+        output.append(f'        {enum:50} = "{name}",\n')
 
 if xml:
-    print('              </tbody>')
+    output.append('              </tbody>\n')
+
+sys.stdout.write(''.join(output))
 
 assert len(entries) >= 99
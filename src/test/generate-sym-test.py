@@ -5,38 +5,47 @@ import os
 import re
 import sys
 
+output = []
+
+def emit(text):
+    output.append(text + '\n')
+
 def process_sym_file(file):
     for line in file:
-        m = re.search(r'^ +([a-zA-Z0-9_]+);', line)
-        if m:
-            if m[1] == 'sd_bus_object_vtable_format':
-                print('        {{"{0}", &{0}}},'.format(m[1]))
-            else:
-                print('        {{"{0}", {0}}},'.format(m[1]))
+        # '    symbol_name;'
+        if not line.startswith(' '):
+            continue
+        name, semicolon, _ = line.lstrip(' ').partition(';')
+        if not semicolon or not name.isascii() or not name.replace('_', 'a').isalnum():
+            continue
+        if name == 'sd_bus_object_vtable_format':
+            emit('        {{"{0}", &{0}}},'.format(name))
+        else:
+            emit('        {{"{0}", {0}}},'.format(name))
 
 def process_source_file(file):
     for line in file:
         # Functions
         m = re.search(r'^_public_\s+(\S+\s+)+\**(\w+)\s*\(', line)
         if m:
-            print('        {{ "{0}", {0} }},'.format(m[2]))
+            emit('        {{ "{0}", {0} }},'.format(m[2]))
         # Variables
         m = re.search(r'^_public_\s+(\S+\s+)+\**(\w+)\s*=', line)
         if m:
-            print('        {{ "{0}", &{0} }},'.format(m[2]))
+            emit('        {{ "{0}", &{0} }},'.format(m[2]))
         # Functions defined through a macro
         m = re.search(r'^DEFINE_PUBLIC_TRIVIAL_REF_FUNC\([^,]+,\s*(\w+)\s*\)', line)
         if m:
-            print('        {{ "{0}_ref", {0}_ref }},'.format(m[1]))
+            emit('        {{ "{0}_ref", {0}_ref }},'.format(m[1]))
         m = re.search(r'^DEFINE_PUBLIC_TRIVIAL_UNREF_FUNC\([^,]+,\s*(\w+)\s*,', line)
         if m:
-            print('        {{ "{0}_unref", {0}_unref }},'.format(m[1]))
+            emit('        {{ "{0}_unref", {0}_unref }},'.format(m[1]))
         m = re.search(r"^DEFINE_PUBLIC_TRIVIAL_REF_UNREF_FUNC\([^,]+,\s*(\w+)\s*,", line)
         if m:
-            print('        {{ "{0}_ref", {0}_ref }},'.format(m[1]))
-            print('        {{ "{0}_unref", {0}_unref }},'.format(m[1]))
+            emit('        {{ "{0}_ref", {0}_ref }},'.format(m[1]))
+            emit('        {{ "{0}_unref", {0}_unref }},'.format(m[1]))
 
-print('''/* SPDX-License-Identifier: LGPL-2.1-or-later */
+emit('''/* SPDX-License-Identifier: LGPL-2.1-or-later */
 
 #include <stdio.h>
 #include <stdlib.h>
@@ -45,14 +54,14 @@ print('''/* SPDX-License-Identifier: LGPL-2.1-or-later */
 ''')
 
 for header in sys.argv[3:]:
-    print('#include "{}"'.format(header.split('/')[-1]))
+    emit('#include "{}"'.format(header.split('/')[-1]))
 
-print('''
+emit('''
 /* We want to check deprecated symbols too, without complaining */
 #pragma GCC diagnostic ignored "-Wdeprecated-declarations"
 ''')
 
-print('''
+emit('''
 struct symbol {
         const char *name;
         const void *symbol;
@@ -62,7 +71,7 @@ static struct symbol symbols_from_sym[] = {''')
 with open(sys.argv[1], "r") as f:
     process_sym_file(f)
 
-print('''        {}
+emit('''        {}
 }, symbols_from_source[] = {''')
 
 for dirpath, _, filenames in sorted(os.walk(sys.argv[2])):
@@ -72,7 +81,7 @@ for dirpath, _, filenames in sorted(os.walk(sys.argv[2])):
         with open(os.path.join(dirpath, filename), "r") as f:
             process_source_file(f)
 
-print('''        {}
+emit('''        {}
 };
 
 static int sort_callback(const void *a, const void *b) {
@@ -112,3 +121,5 @@ int main(void) {
 
         return i == j ? EXIT_SUCCESS : EXIT_FAILURE;
 }''')
+
+sys.stdout.write(''.join(output))
@@ -376,7 +376,11 @@ testcase_lvm_basic() {
     # to something predictable, so we can refer to them later)
     for i in {0..3}; do
         diskpath="${TESTDIR:?}/lvmbasic${i}.img"
-        dd if=/dev/zero of="$diskpath" bs=1M count=32
+        # Reserve the blocks in one go instead of writing out zeroes; fall back
+        # to dd on filesystems without fallocate() support. fallocate keeps the
+        # existing contents, so drop any image left over from a previous run.
+        rm -f "$diskpath"
+        fallocate -l 32M "$diskpath" || dd if=/dev/zero of="$diskpath" bs=1M count=32
         qemu_opts+=(
             "-device ide-hd,bus=ahci0.$i,drive=drive$i,model=foobar,serial=deadbeeflvm$i"
             "-drive format=raw,cache=unsafe,file=$diskpath,if=none,id=drive$i"
@@ -2,10 +2,9 @@
 # SPDX-License-Identifier: LGPL-2.1-or-later
 # pylint: disable=consider-using-with
 
+import argparse
 import ast
 import os
-import re
-import sys
 
 import jinja2
 
@@ -13,31 +12,60 @@ def parse_config_h(filename):
     # Parse config.h file generated by meson.
     ans = {}
     for line in open(filename):
-        m = re.match(r'#define\s+(\w+)\s+(.*)', line)
-        if not m:
+        if not line.startswith('#define'):
             continue
-        a, b = m.groups()
+        # '#define NAME VALUE', skipping function-like macros
+        words = line.split(None, 2)
+        if len(words) < 2 or words[0] != '#define' or not words[1].isidentifier():
+            continue
+        if len(words) > 2:
+            b = words[2].rstrip('\n')
+        elif line[-1].isspace():
+            b = ''
+        else:
+            continue
+        a = words[1]
         if b and b[0] in '0123456789"':
             b = ast.literal_eval(b)
         ans[a] = b
     return ans
 
-def render(filename, defines):
-    text = open(filename).read()
-    template = jinja2.Template(text,
-                               trim_blocks=True,
-                               lstrip_blocks=True,
-                               keep_trailing_newline=True,
-                               undefined=jinja2.StrictUndefined)
+def bytecode_cache(directory):
+    # Templates are compiled once and cached in the build tree, so that
+    # rebuilds only need to render. Without a directory, do not cache.
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return jinja2.FileSystemBytecodeCache(directory)
+
+def render(filename, defines, cache_dir=None):
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader('/'),
+                             bytecode_cache=bytecode_cache(cache_dir),
+                             autoescape=False,
+                             trim_blocks=True,
+                             lstrip_blocks=True,
+                             keep_trailing_newline=True,
+                             undefined=jinja2.StrictUndefined)
+    template = env.get_template(os.path.abspath(filename))
     return template.render(defines)
 
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument('--cache-dir',
+                   help='directory to cache compiled templates in')
+    p.add_argument('config_h')
+    p.add_argument('input')
+    p.add_argument('output')
+    return p.parse_args()
+
 def main():
-    defines = parse_config_h(sys.argv[1])
-    output = render(sys.argv[2], defines)
-    with open(sys.argv[3], 'w') as f:
+    args = parse_args()
+    defines = parse_config_h(args.config_h)
+    output = render(args.input, defines, args.cache_dir)
+    with open(args.output, 'w') as f:
         f.write(output)
-    info = os.stat(sys.argv[2])
-    os.chmod(sys.argv[3], info.st_mode)
+    info = os.stat(args.input)
+    os.chmod(args.output, info.st_mode)
 
 if __name__ == '__main__':
     main()
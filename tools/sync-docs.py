@@ -2,18 +2,23 @@
 # SPDX-License-Identifier: LGPL-2.1-or-later
 
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 import glob
 import json
 import os
 import re
 import subprocess
 import sys
+from pathlib import Path
 
 import requests
 
 BASE_URL = "https://www.freedesktop.org/software/systemd/man/"
 JQUERY_URL = "https://code.jquery.com/jquery-3.7.1.min.js"
 SCRIPT_TAG = '<script src="{}"></script>'
+JQUERY_SCRIPT_TAG = SCRIPT_TAG.format(JQUERY_URL).encode()
+NAV_SCRIPT_TAG = SCRIPT_TAG.format("../nav.js").encode()
+BODY_TAG_RE = re.compile(rb"<body[^>]*>")
 
 NAV_JS = """
 $(document).ready(function() {
@@ -47,26 +52,21 @@ $(document).ready(function() {
 
 
 def process_file(filename):
-    with open(filename) as f:
-        contents = f.read()
+    path = Path(filename)
+    contents = path.read_bytes()
 
-    if SCRIPT_TAG.format("../nav.js") in contents:
+    if NAV_SCRIPT_TAG in contents:
         return
 
-    body_tag = re.search("<body[^>]*>", contents)
-    new_contents = (
-        contents[: body_tag.end()]
-        + SCRIPT_TAG.format(JQUERY_URL)
-        + SCRIPT_TAG.format("../nav.js")
-        + contents[body_tag.end() :]
+    end = BODY_TAG_RE.search(contents).end()
+    path.write_bytes(
+        b"".join((contents[:end], JQUERY_SCRIPT_TAG, NAV_SCRIPT_TAG, contents[end:]))
     )
 
-    with open(filename, "w") as f:
-        f.write(new_contents)
-
 
 def update_index_file(version, index_filename):
-    response = requests.get(BASE_URL + "index.json")
+    with requests.Session() as session:
+        response = session.get(BASE_URL + "index.json", timeout=30)
     if response.status_code == 404:
         index = []
     elif response.ok:
@@ -100,8 +100,9 @@ def main(version, directory, www_target):
     if current_branch != 'main' and not current_branch.endswith("-stable"):
         sys.exit("doc-sync should only be run from main or a stable branch")
 
-    for filename in glob.glob(os.path.join(directory, "*.html")):
-        process_file(filename)
+    # Each page is rewritten independently, so the I/O can overlap.
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(process_file, glob.glob(os.path.join(directory, "*.html"))))
 
     if current_branch == "main":
         version = "devel"
@@ -3,43 +3,55 @@
 
 import collections
 import glob
-import pprint
 import sys
 from pathlib import Path
 
+from lxml import etree as tree
+
 from xml_helper import xml_parse
 
+_refentrytitle = tree.XPath('./refmeta/refentrytitle')
+_manvolnum = tree.XPath('./refmeta/manvolnum')
+_refname = tree.XPath('./refnamediv/refname')
+
 
 def man(page, number):
     return f'{page}.{number}'
 
-def add_rules(rules, name):
-    xml = xml_parse(name)
+def parse_page(name):
+    " (conditional, section, [refname...]) or None if not a refentry "
+    root = xml_parse(name).getroot()
     # print('parsing {}'.format(name), file=sys.stderr)
-    if xml.getroot().tag != 'refentry':
+    if root.tag != 'refentry':
+        return None
+    conditional = root.get('conditional') or ''
+    title = _refentrytitle(root)[0].text
+    number = _manvolnum(root)[0].text
+    refnames = [refname.text for refname in _refname(root)]
+    if title != refnames[0]:
+        raise ValueError('refmeta and refnamediv disagree: ' + name)
+    return conditional, number, refnames
+
+def add_rules(rules, seen, page):
+    if page is None:
         return
-    conditional = xml.getroot().get('conditional') or ''
+    conditional, number, refnames = page
     rulegroup = rules[conditional]
-    refmeta = xml.find('./refmeta')
-    title = refmeta.find('./refentrytitle').text
-    number = refmeta.find('./manvolnum').text
-    refnames = xml.findall('./refnamediv/refname')
-    target = man(refnames[0].text, number)
-    if title != refnames[0].text:
-        raise ValueError('refmeta and refnamediv disagree: ' + name)
+    target = man(refnames[0], number)
     for refname in refnames:
-        assert all(refname not in group
-                   for group in rules.values()), "duplicate page name"
-        alias = man(refname.text, number)
+        alias = man(refname, number)
+        assert alias not in seen, f"duplicate page name {alias}"
+        seen.add(alias)
         rulegroup[alias] = target
         # print('{} => {} [{}]'.format(alias, target, conditional), file=sys.stderr)
 
 def create_rules(xml_files):
     " {conditional => {alias-name => source-name}} "
     rules = collections.defaultdict(dict)
+    seen = set()
     for name in xml_files:
         try:
-            add_rules(rules, name)
+            add_rules(rules, seen, parse_page(name))
         except Exception:
             print("Failed to process", name, file=sys.stderr)
             raise
@@ -61,6 +73,20 @@ MESON_FOOTER = '''\
 # Really, do not edit.
 '''
 
+def format_page(line):
+    # Lay out one [name, section, [alias...], condition] entry the same way
+    # pprint.pformat() with the default width of 80 would, so that the
+    # generated file does not change: on one line if it fits, otherwise one
+    # field per line, with overlong alias lists split one alias per line.
+    text = repr(line)
+    if len(text) <= 78:
+        return text
+    name, section, aliases, condition = line
+    aliases_text = repr(aliases)
+    if len(aliases_text) > 77:
+        aliases_text = '[' + ',\n   '.join(repr(alias) for alias in aliases) + ']'
+    return f'[{name!r},\n  {section!r},\n  {aliases_text},\n  {condition!r}]'
+
 def make_mesonfile(rules, _dist_files):
     # reformat rules as
     # grouped = [ [name, section, [alias...], condition], ...]
@@ -76,7 +102,8 @@ def make_mesonfile(rules, _dist_files):
 
     lines = [ [p[0][:-2], p[0][-1], sorted(a[:-2] for a in aliases), p[1]]
               for p, aliases in sorted(grouped.items()) ]
-    return '\n'.join((MESON_HEADER, pprint.pformat(lines)[1:-1], MESON_FOOTER))
+    text = ',\n '.join(format_page(line) for line in lines)
+    return '\n'.join((MESON_HEADER, text, MESON_FOOTER))
 
 def main():
     source_glob = sys.argv[1]
@@ -94,6 +121,14 @@ def main():
     dist_files = (Path(p).name for p in pages)
     text = make_mesonfile(rules, dist_files)
 
+    # Leave the file alone if nothing changed, so that its mtime is not bumped
+    # and meson does not needlessly reconfigure.
+    try:
+        if target.read_text() == text:
+            return
+    except FileNotFoundError:
+        pass
+
     tmp = target.with_suffix('.tmp')
     tmp.write_text(text)
     tmp.rename(target)